@@ -1,25 +1,42 @@
 #!/usr/bin/env python3
 """Pre-commit hook to verify documentation is up-to-date."""
 
+import os
 import shutil
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 
+def _iter_doc_files(path: Path):
+    """Yield HTML and JS files below path, building a Path only for matches."""
+    for root, _dirs, files in os.walk(path):
+        for name in files:
+            if name.endswith((".html", ".js")):
+                yield Path(root, name)
+
+
+def _normalize_file(file: Path) -> None:
+    """Normalize a single file, rewriting it only when its content changes."""
+    # Read file in binary mode to preserve line endings
+    original = file.read_bytes()
+    # Convert Windows (CRLF) to Unix (LF) line endings
+    normalized = original.replace(b"\r\n", b"\n")
+    # Split into lines and strip trailing whitespace
+    lines = [line.rstrip() for line in normalized.rstrip(b"\n").split(b"\n")]
+    # Ensure file ends with exactly one newline
+    content = b"\n".join(lines) + b"\n"
+    if content != original:
+        file.write_bytes(content)
+
+
 def normalize_file_content(path: Path) -> None:
     """Normalize line endings and whitespace in HTML and JS files."""
-    for file in path.rglob("*"):
-        if file.suffix in (".html", ".js"):
-            # Read file in binary mode to preserve line endings
-            content = file.read_bytes()
-            # Convert Windows (CRLF) to Unix (LF) line endings
-            normalized = content.replace(b"\r\n", b"\n")
-            # Split into lines and strip trailing whitespace
-            lines = [line.rstrip() for line in normalized.rstrip(b"\n").split(b"\n")]
-            # Ensure file ends with exactly one newline
-            content = b"\n".join(lines) + b"\n"
-            file.write_bytes(content)
+    # Files are independent and the work is I/O bound, so process them in parallel
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        # Consume the results so any error is raised here
+        list(executor.map(_normalize_file, _iter_doc_files(path)))
 
 
 def main():
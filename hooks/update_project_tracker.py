@@ -1,57 +1,141 @@
 #!/usr/bin/env python3
 """Pre-commit hook to update and validate project tracker."""
 
+import errno
 import os
+import re
 import subprocess
 import sys
+import time
 from datetime import datetime
 from pathlib import Path
+from typing import Optional
 
 import yaml
-from jsonschema import ValidationError, validate
+from jsonschema import ValidationError
+from jsonschema.validators import validator_for
 
+try:
+    # Prefer the libyaml-backed C implementations when PyYAML was built with them
+    from yaml import CSafeDumper as SafeDumper
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # pragma: no cover
+    from yaml import SafeDumper, SafeLoader
 
-def get_python_files():
+
+# File types listed in the tracker's project structure
+STRUCTURE_SUFFIXES = frozenset({".py", ".toml", ".yaml", ".yml", ".md"})
+
+# Packages whose name mentions one of these tools are tracked as dev dependencies
+DEV_TOOL_PATTERN = re.compile(r"pytest|black|ruff|pre-commit|pyyaml", re.IGNORECASE)
+
+# Changes to these files can alter the installed development dependencies
+DEPENDENCY_FILES = frozenset({"pyproject.toml", "uv.lock", ".pre-commit-config.yaml"})
+
+
+def get_tracked_files(cwd=None):
+    """Get all files tracked by git as raw bytes paths."""
+    result = subprocess.run(
+        ["git", "ls-files", "-z"],
+        capture_output=True,
+        check=True,
+        cwd=cwd,
+    )
+    return tuple(path for path in result.stdout.split(b"\0") if path)
+
+
+def get_python_files(tracked_files):
     """Get all Python files in the project."""
+    return [os.fsdecode(path) for path in tracked_files if path.endswith(b".py")]
+
+
+def get_changed_files(cwd=None):
+    """Get the files changed by the commit the hook runs after."""
+    # Merge commits are diffed against the branch they were merged into, -m
+    # with --first-parent does that on git versions older than --diff-merges
     result = subprocess.run(
-        ["git", "ls-files", "*.py"],
+        [
+            "git",
+            "log",
+            "-1",
+            "-m",
+            "--first-parent",
+            "--name-only",
+            "--format=",
+            "-z",
+            "HEAD",
+        ],
         capture_output=True,
-        text=True,
         check=True,
+        cwd=cwd,
     )
-    return result.stdout.splitlines()
+    return {os.fsdecode(path) for path in result.stdout.split(b"\0") if path}
 
 
-def get_installed_packages():
+def get_installed_packages(cwd=None):
     """Get all installed packages in the virtual environment."""
     result = subprocess.run(
         ["uv", "pip", "freeze"],
         capture_output=True,
         text=True,
         check=True,
+        cwd=cwd,
     )
     return [line.strip() for line in result.stdout.splitlines()]
 
 
-def get_project_structure():
+def get_file_mtimes(paths, cwd=None):
+    """Map each of the given tracked files to its modification time."""
+    wanted = set(paths)
+    # Only walk directories leading to a tracked file, untracked entries such as
+    # __pycache__ or dangling editor lock symlinks are never stat'ed
+    directories = set()
+    for path in wanted:
+        parts = path.split("/")
+        directories.update("/".join(parts[:i]) for i in range(1, len(parts)))
+    # Top-level files have no directory walk to find them in
+    mtimes = {
+        path: os.stat(os.path.join(cwd or "", path)).st_mtime
+        for path in wanted
+        if "/" not in path
+    }
+    pending = [directory for directory in directories if "/" not in directory]
+    while pending:
+        directory = pending.pop()
+        # Keys stay relative to cwd, only the scanned directory is anchored in it
+        with os.scandir(os.path.join(cwd, directory) if cwd else directory) as entries:
+            for entry in entries:
+                # Build git-style POSIX paths so lookups match ls-files output
+                path = f"{directory}/{entry.name}"
+                if path in wanted:
+                    mtimes[path] = entry.stat().st_mtime
+                elif path in directories and entry.is_dir(follow_symlinks=False):
+                    pending.append(path)
+    # Report tracked files deleted from the working tree like a failed stat would
+    missing = wanted - mtimes.keys()
+    if missing:
+        raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), min(missing))
+    return mtimes
+
+
+def format_mtime(mtime: float) -> str:
+    """Format a modification time as a local YYYY-MM-DD date."""
+    return time.strftime("%Y-%m-%d", time.localtime(mtime))
+
+
+def get_project_structure(tracked_files):
     """Get the project structure."""
-    result = subprocess.run(
-        ["git", "ls-files"],
-        capture_output=True,
-        text=True,
-        check=True,
-    )
-    files = result.stdout.splitlines()
     structure = {}
-    for file in files:
-        path = Path(file)
-        if path.suffix in [".py", ".toml", ".yaml", ".yml", ".md"]:
-            current = structure
-            for part in path.parts[:-1]:  # Handle all but the last part (filename)
-                if part not in current:
-                    current[part] = {}
-                current = current[part]
-            current[path.name] = path.as_posix()  # Store full path as string
+    for file in tracked_files:
+        path = os.fsdecode(file)
+        # Filter on the suffix before doing any per-directory work
+        if os.path.splitext(path)[1] not in STRUCTURE_SUFFIXES:
+            continue
+        *parents, name = path.split("/")  # git always reports POSIX paths
+        current = structure
+        for part in parents:
+            current = current.setdefault(part, {})
+        current[name] = path  # Store full path as string
     return structure
 
 
@@ -107,18 +191,41 @@ TRACKER_SCHEMA = {
     },
 }
 
+# Build the validator once instead of on every validate() call
+TRACKER_VALIDATOR = validator_for(TRACKER_SCHEMA)(TRACKER_SCHEMA)
+
+
+def write_tracker(tracker_path: str, data: dict) -> None:
+    """Write the tracker as YAML using a single write call."""
+    # Emitting to bytes first avoids many small writes through a text wrapper
+    content = yaml.dump(
+        data,
+        sort_keys=False,
+        indent=2,
+        default_flow_style=False,
+        Dumper=SafeDumper,
+        encoding="utf-8",
+    )
+    with open(tracker_path, "wb") as f:
+        f.write(content)
+
+
+def update_tracker(tracker_path: str, cwd: Optional[str] = None) -> int:
+    """Update the project tracker with current project state.
 
-def update_tracker(tracker_path: str) -> int:
-    """Update the project tracker with current project state."""
+    The project is read from cwd, or from the current directory when it is None.
+    """
     try:
+        today = datetime.now().strftime("%Y-%m-%d")
+
         # Create tracker file if it doesn't exist
         if not os.path.exists(tracker_path):
             default_tracker = {
                 "project": {
-                    "name": Path.cwd().name,
+                    "name": Path(cwd or os.curdir).resolve().name,
                     "version": "0.1.0",
                     "description": "Python project using uv package manager",
-                    "last_updated": datetime.now().strftime("%Y-%m-%d"),
+                    "last_updated": today,
                 },
                 "environment": {
                     "python_version": (
@@ -143,15 +250,12 @@ def update_tracker(tracker_path: str) -> int:
                 "source_code": {"files": []},
                 "tests": {"files": []},
             }
-            with open(tracker_path, "w") as f:
-                yaml.dump(default_tracker, f, sort_keys=False, indent=2)
-                # Validate immediately after creation
-                validate(instance=default_tracker, schema=TRACKER_SCHEMA)
+            write_tracker(tracker_path, default_tracker)
 
             data = default_tracker
         else:
             with open(tracker_path) as f:
-                data = yaml.safe_load(f)
+                data = yaml.load(f, Loader=SafeLoader)
 
             # Ensure all required sections exist
             if "configuration_files" not in data:
@@ -191,75 +295,76 @@ def update_tracker(tracker_path: str) -> int:
                     break
             data["documentation"]["generated"] = has_files
             if has_files:
-                data["documentation"]["last_updated"] = datetime.fromtimestamp(
+                data["documentation"]["last_updated"] = format_mtime(
                     docs_dir.stat().st_mtime
-                ).strftime("%Y-%m-%d")
+                )
         else:
             data["documentation"]["generated"] = False
 
-        # Validate against schema after all updates
-        validate(instance=data, schema=TRACKER_SCHEMA)
+        # Validate before the slow refresh below, which cannot invalidate the data
+        TRACKER_VALIDATOR.validate(data)
+        data["project"]["last_updated"] = today
+
+        # Trackers that were never fully refreshed get every section populated,
+        # afterwards only refresh what the last commit could have changed
+        if "project_structure" in data:
+            changed_files = get_changed_files(cwd)
+            changed_suffixes = {os.path.splitext(path)[1] for path in changed_files}
+            refresh_dependencies = not DEPENDENCY_FILES.isdisjoint(changed_files)
+            refresh_structure = not STRUCTURE_SUFFIXES.isdisjoint(changed_suffixes)
+            refresh_sources = ".py" in changed_suffixes
+        else:
+            refresh_dependencies = refresh_structure = refresh_sources = True
+
         # Update dependencies
-        packages = get_installed_packages()
-        dev_deps = [
-            pkg
-            for pkg in packages
-            if any(
-                tool in pkg.lower()
-                for tool in ["pytest", "black", "ruff", "pre-commit", "pyyaml"]
+        if refresh_dependencies:
+            packages = get_installed_packages(cwd)
+            data["dependencies"]["development"] = sorted(
+                pkg for pkg in packages if DEV_TOOL_PATTERN.search(pkg)
             )
-        ]
-        data["dependencies"]["development"] = sorted(dev_deps)
+
+        # Both file sections are built from a single git ls-files run
+        if refresh_structure or refresh_sources:
+            tracked_files = get_tracked_files(cwd)
 
         # Update project structure
-        structure = get_project_structure()
-        data["project_structure"] = structure
-
-        # Update source files
-        python_files = get_python_files()
-        src_files = [f for f in python_files if f.startswith("src/")]
-        test_files = [f for f in python_files if f.startswith("tests/")]
-
-        # Update source code section
-        data["source_code"]["files"] = []
-        for src_file in src_files:
-            file_info = {
-                "path": src_file,
-                "status": "Active",
-                "last_modified": datetime.fromtimestamp(
-                    os.path.getmtime(src_file)
-                ).strftime("%Y-%m-%d"),
-            }
-            data["source_code"]["files"].append(file_info)
-
-        # Update tests section
-        data["tests"]["files"] = []
-        for test_file in test_files:
-            # Infer the source file being tested
-            src_file = test_file.replace("tests/test_", "src/")
-            src_file = src_file.replace("_test.py", ".py")
-            test_info = {
-                "path": test_file,
-                "covers": src_file,
-                "last_modified": datetime.fromtimestamp(
-                    os.path.getmtime(test_file)
-                ).strftime("%Y-%m-%d"),
-            }
-            data["tests"]["files"].append(test_info)
+        if refresh_structure:
+            data["project_structure"] = get_project_structure(tracked_files)
 
-        # Write updated tracker
-        with open(tracker_path, "w") as f:
-            yaml.dump(
-                data,
-                f,
-                sort_keys=False,
-                indent=2,
-                default_flow_style=False,
-                Dumper=yaml.SafeDumper,
-            )
+        if refresh_sources:
+            # Update source files
+            python_files = get_python_files(tracked_files)
+            src_files = [f for f in python_files if f.startswith("src/")]
+            test_files = [f for f in python_files if f.startswith("tests/")]
+
+            # Collect modification times with one scan per tracked directory
+            mtimes = get_file_mtimes(src_files + test_files, cwd)
 
-        # Validate against schema
-        validate(instance=data, schema=TRACKER_SCHEMA)
+            # Update source code section
+            data["source_code"]["files"] = []
+            for src_file in src_files:
+                file_info = {
+                    "path": src_file,
+                    "status": "Active",
+                    "last_modified": format_mtime(mtimes[src_file]),
+                }
+                data["source_code"]["files"].append(file_info)
+
+            # Update tests section
+            data["tests"]["files"] = []
+            for test_file in test_files:
+                # Infer the source file being tested
+                src_file = test_file.replace("tests/test_", "src/")
+                src_file = src_file.replace("_test.py", ".py")
+                test_info = {
+                    "path": test_file,
+                    "covers": src_file,
+                    "last_modified": format_mtime(mtimes[test_file]),
+                }
+                data["tests"]["files"].append(test_info)
+
+        # Write updated tracker
+        write_tracker(tracker_path, data)
 
         return 0
     except ValidationError as ve:
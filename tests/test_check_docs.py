@@ -11,7 +11,7 @@ def test_check_docs_success(tmp_path):
 
         with patch("hooks.check_docs.shutil.rmtree") as mock_rmtree, patch(
             "hooks.check_docs.subprocess.run"
-        ) as mock_run:
+        ) as mock_run, patch("hooks.check_docs.normalize_file_content") as mock_norm:
             mock_run.return_value.returncode = 0
             assert main() == 0
 
@@ -24,6 +24,7 @@ def test_check_docs_success(tmp_path):
                 capture_output=True,
                 text=True,
             )
+            mock_norm.assert_called_once_with(mock_path_instance)
 
 
 def test_check_docs_subprocess_error(tmp_path):
@@ -51,7 +52,9 @@ def test_check_docs_no_existing_docs():
         mock_path_instance = mock_path.return_value
         mock_path_instance.exists.return_value = False
 
-        with patch("hooks.check_docs.subprocess.run") as mock_run:
+        with patch("hooks.check_docs.subprocess.run") as mock_run, patch(
+            "hooks.check_docs.normalize_file_content"
+        ):
             mock_run.return_value.returncode = 0
             assert main() == 0
 
@@ -99,3 +102,26 @@ def test_normalize_line_endings_ignores_non_html_js_files(tmp_path):
 
     assert b"\r\n" not in html_file.read_bytes()  # HTML file should be normalized
     assert txt_file.read_bytes() == txt_content  # TXT file should be unchanged
+
+
+def test_normalize_line_endings_processes_nested_directories(tmp_path):
+    """Test that files in nested directories are normalized too."""
+    nested_dir = tmp_path / "src" / "pkg"
+    nested_dir.mkdir(parents=True)
+    test_file = nested_dir / "module.html"
+    test_file.write_bytes(b"Line1  \r\nLine2")
+
+    normalize_file_content(tmp_path)
+
+    assert test_file.read_bytes() == b"Line1\nLine2\n"
+
+
+def test_normalize_line_endings_skips_unchanged_files(tmp_path):
+    """Test that already normalized files are not rewritten."""
+    test_file = tmp_path / "test.html"
+    test_file.write_bytes(b"Line1\nLine2\n")
+
+    with patch("pathlib.Path.write_bytes") as mock_write:
+        normalize_file_content(tmp_path)
+
+    mock_write.assert_not_called()
@@ -1,31 +1,88 @@
 """Tests for project tracker functionality."""
 
+import json
 import os
 import subprocess
+from contextlib import ExitStack, contextmanager
+from datetime import datetime
+from itertools import count
 from pathlib import Path
 from unittest.mock import PropertyMock, mock_open, patch
 
 import pytest
 import yaml
-from jsonschema import validate
 
-from hooks.update_project_tracker import TRACKER_SCHEMA, update_tracker
+from hooks.update_project_tracker import (
+    TRACKER_VALIDATOR,
+    SafeDumper,
+    SafeLoader,
+    format_mtime,
+    get_changed_files,
+    get_file_mtimes,
+    update_tracker,
+)
+
+
+def _load(stream):
+    """Load YAML with the same (libyaml-backed when available) loader as the hook."""
+    return yaml.load(stream, Loader=SafeLoader)
+
+
+# Smallest tracker content that passes schema validation
+_MINIMAL_TRACKER = {
+    "project": {"name": "test", "version": "0.1.0"},
+    "environment": {"python_version": "3.12", "package_manager": "uv"},
+    "dependencies": {"development": []},
+    "documentation": {"generated": False, "last_updated": "", "tool": ""},
+    "configuration_files": {"files": []},
+}
+
+# Tracker carrying documentation details from an earlier pdoc run
+_MOCK_TRACKER = {
+    "project": {"name": "test", "version": "0.1.0"},
+    "environment": {"python_version": "3.12.0", "package_manager": "uv"},
+    "dependencies": {"development": []},
+    "configuration_files": {"files": []},
+    "documentation": {
+        "generated": False,
+        "last_updated": "2025-03-27",
+        "tool": "pdoc",
+    },
+}
+
+# Validate against the schema with the validator the hook builds at import
+_validate_tracker = TRACKER_VALIDATOR.validate
+
+# The trackers serialized once for every test that reads them through mock_open,
+# JSON is also valid YAML for the hook's loader
+_MINIMAL_JSON = json.dumps(_MINIMAL_TRACKER)
+_MOCK_JSON = json.dumps(_MOCK_TRACKER)
+
+
+def _mkdirs(paths):
+    """Create the given leaf directories along with any missing parents."""
+    for path in paths:
+        os.makedirs(path, exist_ok=True)
+
+
+def _touch_many(paths):
+    """Create empty files with a bare open/close instead of Path.touch()."""
+    for path in paths:
+        os.close(os.open(path, os.O_CREAT | os.O_WRONLY, 0o644))
 
 
 @pytest.fixture
 def tracker_path(tmp_path):
     """Fixture providing path to test tracker file."""
-    path = tmp_path / "project_tracker.yaml"
-    yield path
-    if path.exists():
-        path.unlink()
+    # pytest removes tmp_path itself, so no teardown is needed
+    return tmp_path / "project_tracker.yaml"
 
 
 def test_documentation_section_created_when_missing(tracker_path):
     """Test that documentation section is created when missing."""
     # Create minimal tracker without documentation section
     with open(tracker_path, "w") as f:
-        yaml.dump(
+        json.dump(
             {
                 "project": {"name": "test", "version": "1.0.0"},
                 "environment": {"python_version": "3.12", "package_manager": "uv"},
@@ -39,23 +96,23 @@ def test_documentation_section_created_when_missing(tracker_path):
 
     # Verify documentation section was added
     with open(tracker_path) as f:
-        data = yaml.safe_load(f)
+        data = _load(f)
         assert "documentation" in data
         assert data["documentation"]["generated"] is False
         assert data["documentation"]["last_updated"] == ""
-        validate(instance=data, schema=TRACKER_SCHEMA)
+        _validate_tracker(data)
 
 
 def test_documentation_with_missing_docs_dir(tracker_path):
     """Test documentation handling when docs directory doesn't exist."""
     # Ensure docs directory doesn't exist
-    if Path("docs").exists():
+    if os.path.isdir("docs"):
         pytest.skip("docs directory exists")
 
     update_tracker(str(tracker_path))
 
     with open(tracker_path) as f:
-        data = yaml.safe_load(f)
+        data = _load(f)
         assert data["documentation"]["generated"] is False
         assert data["documentation"]["last_updated"] == ""
 
@@ -69,7 +126,7 @@ def test_documentation_with_existing_docs_dir(tracker_path, tmp_path):
     update_tracker(str(tracker_path))
 
     with open(tracker_path) as f:
-        data = yaml.safe_load(f)
+        data = _load(f)
         assert data["documentation"]["generated"] is True
         assert data["documentation"]["last_updated"] != ""
 
@@ -84,89 +141,85 @@ def test_new_tracker_creation(tracker_path):
 
     assert tracker_path.exists()
     with open(tracker_path) as f:
-        data = yaml.safe_load(f)
+        data = _load(f)
         assert "project" in data
         assert "environment" in data
         assert "dependencies" in data
         assert "configuration_files" in data
         assert "source_code" in data
         assert "tests" in data
-        validate(instance=data, schema=TRACKER_SCHEMA)
+        _validate_tracker(data)
 
 
-@pytest.fixture
-def mock_git_files(monkeypatch, tmp_path):
-    """Mock git ls-files output."""
+# Canned command results shared by every fake subprocess.run
+_CP_ALL_FILES = subprocess.CompletedProcess(
+    [], 0, b"src/main.py\0src/utils.py\0tests/test_main.py\0pyproject.toml\0", b""
+)
+_CP_SRC_FILES = subprocess.CompletedProcess(
+    [], 0, b"src/main.py\0tests/test_main.py\0", b""
+)
+_CP_PIP_FREEZE = subprocess.CompletedProcess(
+    [], 0, "pytest==8.0.0\nruff==0.2.0\npre-commit==3.5.0\n", ""
+)
+_CP_EMPTY = subprocess.CompletedProcess([], 0, b"", b"")
 
-    def mock_run(*args, **kwargs):
-        if "ls-files" in args[0]:
-            if "*.py" in args[0]:
-                return subprocess.CompletedProcess(
-                    args=args,
-                    returncode=0,
-                    stdout="src/main.py\nsrc/utils.py\ntests/test_main.py\n",
-                    stderr="",
-                )
-            return subprocess.CompletedProcess(
-                args=args,
-                returncode=0,
-                stdout="src/main.py\nsrc/utils.py\ntests/test_main.py\npyproject.toml\n",
-                stderr="",
-            )
-        if "pip" in args[0] and "freeze" in args[0]:
-            return subprocess.CompletedProcess(
-                args=args,
-                returncode=0,
-                stdout="pytest==8.0.0\nruff==0.2.0\npre-commit==3.5.0\n",
-                stderr="",
-            )
-        return subprocess.run(*args, **kwargs)
+# Canned results for the commands update_tracker runs, keyed by their argv
+_CMD_TABLE = {
+    ("git", "ls-files", "-z"): _CP_ALL_FILES,
+    ("uv", "pip", "freeze"): _CP_PIP_FREEZE,
+}
 
-    # Create mock files
-    src_dir = tmp_path / "src"
-    src_dir.mkdir()
-    (src_dir / "main.py").touch()
-    (src_dir / "utils.py").touch()
 
-    tests_dir = tmp_path / "tests"
-    tests_dir.mkdir()
-    (tests_dir / "test_main.py").touch()
+def _mock_run(args, **kwargs):
+    """Fake subprocess.run answering from _CMD_TABLE."""
+    return _CMD_TABLE.get(tuple(args), _CP_EMPTY)
 
-    (tmp_path / "pyproject.toml").touch()
 
-    os.chdir(tmp_path)
-    monkeypatch.setattr("subprocess.run", mock_run)
+@contextmanager
+def patched_env(tracker_json):
+    """Patch the tracker file, its existence check and subprocess.run together.
 
-    yield
+    Yields the subprocess.run mock so tests can override its behaviour.
+    """
+    with ExitStack() as stack:
+        stack.enter_context(patch("builtins.open", mock_open(read_data=tracker_json)))
+        stack.enter_context(patch("os.path.exists", return_value=True))
+        yield stack.enter_context(patch("subprocess.run", return_value=_CP_EMPTY))
 
-    # Change back to original directory
-    os.chdir(Path(__file__).parent.parent)
 
+@pytest.fixture(scope="session")
+def git_files_tree(tmp_path_factory):
+    """Fixture providing a project tree matching the mocked git ls-files output."""
+    root = tmp_path_factory.mktemp("project")
 
-@pytest.fixture
-def mock_installed_packages(monkeypatch):
-    """Mock uv pip freeze output."""
-
-    def mock_run(*args, **kwargs):
-        if "pip" in args[0] and "freeze" in args[0]:
+    # Create mock files
+    (root / "src").mkdir()
+    (root / "tests").mkdir()
+    _touch_many(
+        [
+            root / "src" / "main.py",
+            root / "src" / "utils.py",
+            root / "tests" / "test_main.py",
+            root / "pyproject.toml",
+        ]
+    )
 
-            class MockResult:
-                stdout = "pytest==8.0.0\nruff==0.2.0\npre-commit==3.5.0"
-                returncode = 0
+    return root
 
-            return MockResult()
-        # Pass through other commands
-        return subprocess.run(*args, **kwargs)
 
-    monkeypatch.setattr("subprocess.run", mock_run)
+@pytest.fixture
+def mock_git_files(monkeypatch, git_files_tree):
+    """Mock git ls-files output and provide the matching project tree."""
+    monkeypatch.setattr("subprocess.run", _mock_run)
+    return str(git_files_tree)
 
 
 def test_project_structure_tracking(tracker_path, mock_git_files):
     """Test tracking of project structure."""
-    update_tracker(str(tracker_path))
+    update_tracker(str(tracker_path), cwd=mock_git_files)
 
     with open(tracker_path) as f:
-        data = yaml.safe_load(f)
+        data = _load(f)
         assert "project_structure" in data
         structure = data["project_structure"]
         assert "src" in structure
@@ -174,12 +227,12 @@ def test_project_structure_tracking(tracker_path, mock_git_files):
         assert "utils.py" in structure["src"]
 
 
-def test_dependencies_tracking(tracker_path, mock_installed_packages, mock_git_files):
+def test_dependencies_tracking(tracker_path, mock_git_files):
     """Test tracking of project dependencies."""
-    update_tracker(str(tracker_path))
+    update_tracker(str(tracker_path), cwd=mock_git_files)
 
     with open(tracker_path) as f:
-        data = yaml.safe_load(f)
+        data = _load(f)
         assert "dependencies" in data
         dev_deps = data["dependencies"]["development"]
         assert any("pytest" in dep for dep in dev_deps)
@@ -189,10 +242,10 @@ def test_dependencies_tracking(tracker_path, mock_installed_packages, mock_git_f
 
 def test_source_and_test_files_tracking(tracker_path, mock_git_files):
     """Test tracking of source and test files."""
-    update_tracker(str(tracker_path))
+    update_tracker(str(tracker_path), cwd=mock_git_files)
 
     with open(tracker_path) as f:
-        data = yaml.safe_load(f)
+        data = _load(f)
         assert "source_code" in data
         assert "tests" in data
 
@@ -203,6 +256,63 @@ def test_source_and_test_files_tracking(tracker_path, mock_git_files):
         assert any(file["path"] == "tests/test_main.py" for file in test_files)
 
 
+def test_project_read_from_cwd(tracker_path, mock_git_files):
+    """Test that a new tracker describes the project in cwd."""
+    with patch("subprocess.run", side_effect=_mock_run) as mock_run:
+        assert update_tracker(str(tracker_path), cwd=mock_git_files) == 0
+
+    assert all(call.kwargs["cwd"] == mock_git_files for call in mock_run.call_args_list)
+    with open(tracker_path) as f:
+        data = _load(f)
+    assert data["project"]["name"] == os.path.basename(mock_git_files)
+
+
+def test_untracked_files_not_stated(tracker_path, tmp_path, monkeypatch):
+    """Test that untracked entries, like a dangling editor lock, are skipped."""
+    root = tmp_path / "project"
+    _mkdirs([root / "src" / "__pycache__", root / "tests"])
+    _touch_many(
+        [
+            root / "src" / "main.py",
+            root / "src" / "utils.py",
+            root / "src" / "__pycache__" / "main.cpython-312.pyc",
+            root / "tests" / "test_main.py",
+        ]
+    )
+    os.symlink("user@host.1234", root / "src" / ".#main.py")
+    monkeypatch.setattr("subprocess.run", _mock_run)
+
+    assert update_tracker(str(tracker_path), cwd=str(root)) == 0
+
+    with open(tracker_path) as f:
+        data = _load(f)
+    assert [file["path"] for file in data["source_code"]["files"]] == [
+        "src/main.py",
+        "src/utils.py",
+    ]
+
+
+def test_missing_tracked_file_reported(tracker_path, tmp_path, monkeypatch, capsys):
+    """Test that a tracked file deleted from the working tree is reported."""
+    root = tmp_path / "project"
+    _mkdirs([root / "src", root / "tests"])
+    _touch_many([root / "src" / "main.py", root / "tests" / "test_main.py"])
+    monkeypatch.setattr("subprocess.run", _mock_run)
+
+    assert update_tracker(str(tracker_path), cwd=str(root)) == 1
+    assert "No such file or directory: 'src/utils.py'" in capsys.readouterr().out
+
+
+def test_file_mtimes_of_top_level_files(git_files_tree):
+    """Test that tracked files outside any directory get their mtime too."""
+    mtimes = get_file_mtimes(["pyproject.toml", "src/main.py"], str(git_files_tree))
+
+    assert mtimes == {
+        "pyproject.toml": os.stat(git_files_tree / "pyproject.toml").st_mtime,
+        "src/main.py": os.stat(git_files_tree / "src" / "main.py").st_mtime,
+    }
+
+
 def test_validation_error_handling(tmp_path):
     tracker_path = tmp_path / "project_tracker.yaml"
     invalid_data = {
@@ -220,9 +330,7 @@ def test_validation_error_handling(tmp_path):
         },
     }
 
-    with patch("builtins.open", mock_open(read_data=yaml.dump(invalid_data))), patch(
-        "os.path.exists", return_value=True
-    ):
+    with patched_env(json.dumps(invalid_data)):
         result = update_tracker(str(tracker_path))
         assert result == 1
 
@@ -230,9 +338,7 @@ def test_validation_error_handling(tmp_path):
 def test_subprocess_error_handling(tmp_path):
     tracker_path = tmp_path / "project_tracker.yaml"
 
-    with patch("subprocess.run") as mock_run, patch(
-        "os.path.exists", return_value=True
-    ), patch("builtins.open", mock_open()):
+    with patched_env(_MINIMAL_JSON) as mock_run:
         mock_run.side_effect = subprocess.CalledProcessError(1, "git ls-files")
         result = update_tracker(str(tracker_path))
         assert result == 1
@@ -244,48 +350,14 @@ def test_documentation_generated_status(tmp_path):
     docs_dir.mkdir()
     (docs_dir / "index.html").write_text("test")
 
-    mock_data = {
-        "project": {"name": "test", "version": "0.1.0"},
-        "environment": {"python_version": "3.12.0", "package_manager": "uv"},
-        "dependencies": {"development": []},
-        "configuration_files": {"files": []},
-        "documentation": {
-            "generated": False,
-            "last_updated": "2025-03-27",
-            "tool": "pdoc",
-        },
-    }
-
-    with patch("os.path.exists", return_value=True), patch(
-        "builtins.open", mock_open(read_data=yaml.dump(mock_data))
-    ), patch("subprocess.run") as mock_run, patch(
-        "pathlib.Path", return_value=docs_dir
-    ):
-        mock_run.return_value.stdout = ""
-        mock_run.return_value.returncode = 0
+    with patched_env(_MOCK_JSON), patch("pathlib.Path", return_value=docs_dir):
         result = update_tracker(str(tracker_path))
         assert result == 0
 
 
 def test_missing_optional_sections(tmp_path):
     tracker_path = tmp_path / "project_tracker.yaml"
-    minimal_data = {
-        "project": {"name": "test", "version": "0.1.0"},
-        "environment": {"python_version": "3.12.0", "package_manager": "uv"},
-        "dependencies": {"development": []},
-        "configuration_files": {"files": []},
-        "documentation": {
-            "generated": False,
-            "last_updated": "2025-03-27",
-            "tool": "pdoc",
-        },
-    }
-
-    with patch("builtins.open", mock_open(read_data=yaml.dump(minimal_data))), patch(
-        "os.path.exists", return_value=True
-    ), patch("subprocess.run") as mock_run:
-        mock_run.return_value.stdout = ""
-        mock_run.return_value.returncode = 0
+    with patched_env(_MOCK_JSON):
         result = update_tracker(str(tracker_path))
         assert result == 0
 
@@ -296,208 +368,149 @@ def test_documentation_update_edge_cases(tmp_path):
     docs_dir.mkdir()
     (docs_dir / "index.html").write_text("test")
 
-    mock_data = {
-        "project": {"name": "test", "version": "0.1.0"},
-        "environment": {"python_version": "3.12.0", "package_manager": "uv"},
-        "dependencies": {"development": []},
-        "configuration_files": {"files": []},
-        "documentation": {
-            "generated": False,
-            "last_updated": "2025-03-27",
-            "tool": "pdoc",
-        },
-    }
-
-    with patch("os.path.exists", return_value=True), patch(
-        "builtins.open", mock_open(read_data=yaml.dump(mock_data))
-    ), patch("subprocess.run") as mock_run, patch(
+    with patched_env(_MOCK_JSON) as mock_run, patch(
         "pathlib.Path", return_value=docs_dir
-    ), patch(
-        "hooks.update_project_tracker.datetime"
-    ) as mock_datetime:
+    ), patch("hooks.update_project_tracker.datetime") as mock_datetime:
         # Mock datetime for consistent results
         mock_datetime.now.return_value.strftime.return_value = "2025-03-27"
-        mock_datetime.fromtimestamp.return_value.strftime.return_value = "2025-03-27"
 
         # Mock subprocess commands
-        def mock_subprocess(*args, **kwargs):
-            if "git" in args[0]:
-                return subprocess.CompletedProcess(
-                    args=args,
-                    returncode=0,
-                    stdout="src/main.py\ntests/test_main.py\n",
-                    stderr="",
-                )
-            if "uv" in args[0]:
-                return subprocess.CompletedProcess(
-                    args=args, returncode=0, stdout="pytest==8.0.0\n", stderr=""
-                )
-            return subprocess.CompletedProcess(
-                args=args, returncode=0, stdout="", stderr=""
-            )
-
-        mock_run.side_effect = mock_subprocess
+        results = {
+            ("git", "ls-files", "-z"): _CP_SRC_FILES,
+            ("uv", "pip", "freeze"): _CP_PIP_FREEZE,
+        }
+        mock_run.side_effect = lambda args, **kwargs: results.get(
+            tuple(args), _CP_EMPTY
+        )
         result = update_tracker(str(tracker_path))
         assert result == 0
 
 
-def test_documentation_dir_error_handling(tracker_path):
-    """Test error handling when docs directory has permission issues."""
-    with patch("pathlib.Path.exists") as mock_exists, patch(
-        "pathlib.Path.iterdir"
-    ) as mock_iterdir:
-        # Make exists() return True but iterdir() raise PermissionError
-        mock_exists.return_value = True
-        mock_iterdir.side_effect = PermissionError("Permission denied")
-
-        # Create minimal tracker
-        with open(tracker_path, "w") as f:
-            yaml.dump(
-                {
-                    "project": {"name": "test", "version": "0.1.0"},
-                    "environment": {"python_version": "3.12", "package_manager": "uv"},
-                    "dependencies": {"development": []},
-                    "documentation": {
-                        "generated": False,
-                        "last_updated": "",
-                        "tool": "",
-                    },
-                    "configuration_files": {"files": []},
-                },
-                f,
-            )
+def _fail_git_ls_files(args, **kwargs):
+    """Fake subprocess.run where git ls-files exits with an error."""
+    if args[:2] == ["git", "ls-files"]:
+        raise subprocess.CalledProcessError(1, args)
+    return _CP_EMPTY
 
-        result = update_tracker(str(tracker_path))
-        assert result == 1
 
+def _invalid_git_ls_files(args, **kwargs):
+    """Fake subprocess.run where git ls-files output cannot be processed."""
+    if args[:2] == ["git", "ls-files"]:
+        raise ValueError("Invalid path characters in git output")
+    return _CP_EMPTY
 
-def test_file_modification_error_handling(tracker_path, mock_git_files):
-    """Test error handling when file modification time can't be accessed."""
-    with patch("os.path.getmtime") as mock_getmtime:
-        mock_getmtime.side_effect = OSError("File access error")
-
-        # Create minimal tracker
-        with open(tracker_path, "w") as f:
-            yaml.dump(
-                {
-                    "project": {"name": "test", "version": "0.1.0"},
-                    "environment": {"python_version": "3.12", "package_manager": "uv"},
-                    "dependencies": {"development": []},
-                    "documentation": {
-                        "generated": False,
-                        "last_updated": "",
-                        "tool": "",
-                    },
-                    "configuration_files": {"files": []},
-                },
-                f,
-            )
 
-        result = update_tracker(str(tracker_path))
-        assert result == 1
+def _tracked_src_files(args, **kwargs):
+    """Fake subprocess.run reporting tracked source and test files."""
+    if args[:2] == ["git", "ls-files"]:
+        return _CP_SRC_FILES
+    return _CP_EMPTY
+
+
+# Each case maps patch targets to patch() keyword arguments that make
+# update_tracker fail while processing the minimal tracker, along with the
+# message that failure is reported with
+ERROR_CASES = [
+    pytest.param(
+        {
+            "pathlib.Path.exists": {"return_value": True},
+            "pathlib.Path.iterdir": {
+                "side_effect": PermissionError("Permission denied")
+            },
+        },
+        "Permission denied",
+        id="docs-dir-permission-error",
+    ),
+    pytest.param(
+        {
+            "subprocess.run": {"side_effect": _tracked_src_files},
+            "os.scandir": {"side_effect": OSError("File access error")},
+        },
+        "File access error",
+        id="file-mtime-error",
+    ),
+    pytest.param(
+        {
+            "pathlib.Path.exists": {"return_value": True},
+            "pathlib.Path.iterdir": {"return_value": [Path("index.html")]},
+            "pathlib.Path.stat": {"side_effect": OSError("Stat failed")},
+        },
+        "Stat failed",
+        id="docs-dir-stat-error",
+    ),
+    pytest.param(
+        {"subprocess.run": {"side_effect": _fail_git_ls_files}},
+        "returned non-zero exit status 1",
+        id="git-ls-files-failure",
+    ),
+    pytest.param(
+        {
+            "pathlib.Path.parent": {
+                "new_callable": PropertyMock,
+                "side_effect": RuntimeError("Path error"),
+            }
+        },
+        "Path error",
+        id="docs-dir-path-error",
+    ),
+    pytest.param(
+        {"subprocess.run": {"side_effect": _invalid_git_ls_files}},
+        "Invalid path characters in git output",
+        id="git-ls-files-invalid-output",
+    ),
+]
+
+
+# open() and os.path.exists() are mocked, so the tracker is never touched on disk.
+# Keeping it outside pytest's temporary directories makes the hook locate docs/
+# through Path.parent, like it does for a real project.
+_MOCKED_TRACKER_PATH = "/nonexistent/project_tracker.yaml"
+
+
+@pytest.mark.parametrize("patches,message", ERROR_CASES)
+def test_error_paths(capsys, patches, message):
+    """Test that failures while updating the minimal tracker are reported."""
+    with ExitStack() as stack:
+        stack.enter_context(patch("os.path.exists", return_value=True))
+        stack.enter_context(patch("builtins.open", mock_open(read_data=_MINIMAL_JSON)))
+        for target, kwargs in patches.items():
+            stack.enter_context(patch(target, **kwargs))
+
+        assert update_tracker(_MOCKED_TRACKER_PATH) == 1
+
+    assert message in capsys.readouterr().out
 
 
 def test_docs_dir_empty_handling(tracker_path):
     """Test handling when docs directory exists but is empty."""
-    docs_dir = Path(tracker_path).parent / "docs"
-    docs_dir.mkdir(exist_ok=True)
+    os.mkdir(tracker_path.parent / "docs")
 
     update_tracker(str(tracker_path))
 
     with open(tracker_path) as f:
-        data = yaml.safe_load(f)
+        data = _load(f)
         assert data["documentation"]["generated"] is False
         assert data["documentation"]["last_updated"] == ""
 
 
 def test_git_command_error_with_retry(tracker_path):
     """Test handling of git command errors with retry logic."""
-    call_count = 0
+    calls = count()
 
     def mock_run(*args, **kwargs):
-        nonlocal call_count
-        call_count += 1
-        if call_count <= 1:  # Fail first attempt
+        if next(calls) < 1:  # Fail first attempt
             raise subprocess.CalledProcessError(1, args[0])
         # Return success on subsequent attempts
-        return subprocess.CompletedProcess(args, 0, stdout="", stderr="")
+        return _CP_EMPTY
 
     with patch("subprocess.run", side_effect=mock_run):
         result = update_tracker(str(tracker_path))
         assert result == 1  # Should still fail due to incomplete data
 
 
-def test_docs_dir_stat_error(tracker_path):
-    """Test error handling when docs directory stat() fails."""
-    docs_dir = Path(tracker_path).parent / "docs"
-    docs_dir.mkdir(exist_ok=True)
-
-    with patch("pathlib.Path.exists") as mock_exists, patch(
-        "pathlib.Path.iterdir"
-    ) as mock_iterdir, patch("pathlib.Path.stat") as mock_stat:
-        mock_exists.return_value = True
-        mock_iterdir.return_value = [docs_dir / "index.html"]  # Simulate a file exists
-        mock_stat.side_effect = OSError("Permission denied")
-
-        # Create minimal tracker
-        with open(tracker_path, "w") as f:
-            yaml.dump(
-                {
-                    "project": {"name": "test", "version": "0.1.0"},
-                    "environment": {"python_version": "3.12", "package_manager": "uv"},
-                    "dependencies": {"development": []},
-                    "documentation": {
-                        "generated": False,
-                        "last_updated": "",
-                        "tool": "",
-                    },
-                    "configuration_files": {"files": []},
-                },
-                f,
-            )
-
-        result = update_tracker(str(tracker_path))
-        assert result == 1
-
-
-def test_git_command_failure_handling(tracker_path):
-    """Test handling of multiple git command failures."""
-    with patch("subprocess.run") as mock_run:
-
-        def fail_specific_commands(*args, **kwargs):
-            if "git ls-files *.py" in " ".join(args[0]):
-                raise subprocess.CalledProcessError(1, args[0])
-            if "git ls-files" in " ".join(args[0]):
-                return subprocess.CompletedProcess(args[0], 0, stdout="", stderr="")
-            return subprocess.CompletedProcess(args[0], 0, stdout="", stderr="")
-
-        mock_run.side_effect = fail_specific_commands
-
-        # Create minimal tracker
-        with open(tracker_path, "w") as f:
-            yaml.dump(
-                {
-                    "project": {"name": "test", "version": "0.1.0"},
-                    "environment": {"python_version": "3.12", "package_manager": "uv"},
-                    "dependencies": {"development": []},
-                    "documentation": {
-                        "generated": False,
-                        "last_updated": "",
-                        "tool": "",
-                    },
-                    "configuration_files": {"files": []},
-                },
-                f,
-            )
-
-        result = update_tracker(str(tracker_path))
-        assert result == 1
-
-
 def test_iterdir_empty_docs_dir(tracker_path):
     """Test handling when docs directory exists but is empty and iterdir() fails."""
-    docs_dir = Path(tracker_path).parent / "docs"
-    docs_dir.mkdir(exist_ok=True)
+    os.mkdir(tracker_path.parent / "docs")
 
     with patch("pathlib.Path.exists") as mock_exists, patch(
         "pathlib.Path.iterdir"
@@ -514,8 +527,7 @@ def test_iterdir_empty_docs_dir(tracker_path):
 def test_docs_dir_stat_race_condition(tracker_path):
     """Test handling of race condition where docs dir exists but disappears
     during processing."""
-    docs_dir = Path(tracker_path).parent / "docs"
-    docs_dir.mkdir(exist_ok=True)
+    os.mkdir(tracker_path.parent / "docs")
     exists_call_count = 0
 
     def mock_exists(self):
@@ -532,79 +544,45 @@ def test_docs_dir_stat_race_condition(tracker_path):
         mock_iterdir.side_effect = FileNotFoundError("Directory no longer exists")
         update_tracker(str(tracker_path))
         with open(tracker_path) as f:
-            data = yaml.safe_load(f)
+            data = _load(f)
             assert data["documentation"]["generated"] is False
             assert data["documentation"]["last_updated"] == ""
 
 
 def test_docs_dir_complex_structure(tracker_path):
     """Test handling of complex documentation directory structure with mixed content."""
-    # Create initial tracker file
-    initial_data = {
-        "project": {"name": "test", "version": "0.1.0"},
-        "environment": {"python_version": "3.12", "package_manager": "uv"},
-        "dependencies": {"development": []},
-        "documentation": {"generated": False, "last_updated": "", "tool": ""},
-        "configuration_files": {"files": []},
-    }
+    # Create initial tracker file in the block-style YAML the hook itself writes
     with open(tracker_path, "w") as f:
-        yaml.dump(initial_data, f)
-
-    # Set up docs directory structure
-    docs_dir = Path(tracker_path).parent / "docs"
-    docs_dir.mkdir(exist_ok=True)
-    (docs_dir / "empty_dir").mkdir()
-    (docs_dir / "index.html").touch()
+        yaml.dump(_MINIMAL_TRACKER, f, Dumper=SafeDumper)
 
-    # Create nested structure
+    # Set up docs directory structure, the leaves share the docs parent
+    docs_dir = tracker_path.parent / "docs"
     nested_dir = docs_dir / "nested"
-    nested_dir.mkdir()
-    (nested_dir / "api.md").touch()
+    _mkdirs([docs_dir / "empty_dir", nested_dir])
+    _touch_many([docs_dir / "index.html", nested_dir / "api.md"])
 
-    mock_time = 1711497600  # 2024-03-27 00:00:00
-
-    with patch("os.path.getmtime") as mock_getmtime, patch(
-        "hooks.update_project_tracker.datetime"
-    ) as mock_datetime:
-        # Mock the modification time for consistent testing
-        mock_getmtime.return_value = mock_time
-        mock_datetime.fromtimestamp.return_value.strftime.return_value = "2024-03-27"
+    with patch("hooks.update_project_tracker.format_mtime") as mock_format_mtime:
+        # Mock the formatted modification time for consistent testing
+        mock_format_mtime.return_value = "2024-03-27"
 
         update_tracker(str(tracker_path))
 
         with open(tracker_path) as f:
-            data = yaml.safe_load(f)
+            data = _load(f)
             assert data["documentation"]["generated"] is True
             assert data["documentation"]["last_updated"] == "2024-03-27"
 
 
 def test_docs_dir_complex_yaml_error(tracker_path):
     """Test handling of YAML errors during tracker updates."""
-    docs_dir = Path(tracker_path).parent / "docs"
-    docs_dir.mkdir(exist_ok=True)
-    (docs_dir / "index.html").touch()
+    docs_dir = tracker_path.parent / "docs"
+    os.mkdir(docs_dir)
+    _touch_many([docs_dir / "index.html"])
 
     with patch("builtins.open") as mock_open:
         # First call to open() returns valid data
         mock_open.side_effect = [
-            mock_open(
-                read_data=yaml.dump(
-                    {
-                        "project": {"name": "test", "version": "0.1.0"},
-                        "environment": {
-                            "python_version": "3.12",
-                            "package_manager": "uv",
-                        },
-                        "dependencies": {"development": []},
-                        "documentation": {
-                            "generated": False,
-                            "last_updated": "",
-                            "tool": "",
-                        },
-                        "configuration_files": {"files": []},
-                    }
-                )
-            ).return_value,
+            mock_open(read_data=_MINIMAL_JSON).return_value,
             # Second call raises yaml error
             yaml.YAMLError("Invalid YAML"),
         ]
@@ -613,67 +591,99 @@ def test_docs_dir_complex_yaml_error(tracker_path):
         assert result == 1
 
 
-def test_docs_dir_path_error(tracker_path):
-    """Test handling of path-related errors in documentation handling."""
-    with patch("pathlib.Path.parent", new_callable=PropertyMock) as mock_parent, patch(
-        "subprocess.run"
-    ) as mock_run:
-        # Mock parent property to raise error
-        mock_parent.side_effect = RuntimeError("Path error")
-        # Mock subprocess to prevent other errors
-        mock_run.return_value = subprocess.CompletedProcess([], 0, stdout="", stderr="")
-
-        # Create minimal tracker
-        with open(tracker_path, "w") as f:
-            yaml.dump(
-                {
-                    "project": {"name": "test", "version": "0.1.0"},
-                    "environment": {"python_version": "3.12", "package_manager": "uv"},
-                    "dependencies": {"development": []},
-                    "documentation": {
-                        "generated": False,
-                        "last_updated": "",
-                        "tool": "",
-                    },
-                    "configuration_files": {"files": []},
-                },
-                f,
-            )
-
-        with patch(
-            "pathlib.Path.exists", return_value=True
-        ):  # Ensure path.exists returns True
-            result = update_tracker(str(tracker_path))
-            assert result == 1
-
-
-def test_git_command_output_error(tracker_path):
-    """Test handling of invalid git command output."""
-    with patch("subprocess.run") as mock_run:
-
-        def mock_subprocess(*args, **kwargs):
-            if "git ls-files" in " ".join(args[0]):
-                raise ValueError("Invalid path characters in git output")
-            return subprocess.CompletedProcess(args[0], 0, stdout="", stderr="")
-
-        mock_run.side_effect = mock_subprocess
-
-        # Create minimal tracker
-        with open(tracker_path, "w") as f:
-            yaml.dump(
-                {
-                    "project": {"name": "test", "version": "0.1.0"},
-                    "environment": {"python_version": "3.12", "package_manager": "uv"},
-                    "dependencies": {"development": []},
-                    "documentation": {
-                        "generated": False,
-                        "last_updated": "",
-                        "tool": "",
-                    },
-                    "configuration_files": {"files": []},
-                },
-                f,
-            )
+@pytest.mark.parametrize(
+    "changed_files,expected_commands,structure_refreshed,sources_refreshed",
+    [
+        (b"", [["git", "log"]], False, False),
+        (b"docs/index.html\0", [["git", "log"]], False, False),
+        (b"README.md\0", [["git", "log"], ["git", "ls-files"]], True, False),
+        (b"src/main.py\0", [["git", "log"], ["git", "ls-files"]], True, True),
+        (
+            b"pyproject.toml\0",
+            [["git", "log"], ["uv", "pip"], ["git", "ls-files"]],
+            True,
+            False,
+        ),
+    ],
+)
+def test_refresh_limited_to_changed_files(
+    tracker_path,
+    changed_files,
+    expected_commands,
+    structure_refreshed,
+    sources_refreshed,
+):
+    """Test that an already populated tracker only refreshes what changed."""
+    with open(tracker_path, "w") as f:
+        json.dump(
+            {
+                "project": {"name": "test", "version": "0.1.0"},
+                "environment": {"python_version": "3.12", "package_manager": "uv"},
+                "dependencies": {"development": ["pytest==7.0.0"]},
+                "documentation": {"generated": False, "last_updated": "", "tool": ""},
+                "configuration_files": {"files": []},
+                "project_structure": {"README.md": "README.md"},
+                "source_code": {"files": [{"path": "src/old.py"}]},
+            },
+            f,
+        )
+    commands = []
 
-        result = update_tracker(str(tracker_path))
-        assert result == 1
+    def mock_run(args, **kwargs):
+        commands.append(args[:2])
+        if args[1] == "log":
+            return subprocess.CompletedProcess(args, 0, stdout=changed_files)
+        if args[0] == "uv":
+            return subprocess.CompletedProcess(args, 0, stdout="pytest==8.0.0\n")
+        return _CP_EMPTY
+
+    with patch("subprocess.run", side_effect=mock_run):
+        assert update_tracker(str(tracker_path)) == 0
+
+    assert commands == expected_commands
+    with open(tracker_path) as f:
+        data = _load(f)
+    assert data["project"]["last_updated"] != ""
+    refreshed = ["uv", "pip"] in expected_commands
+    assert data["dependencies"]["development"] == [
+        "pytest==8.0.0" if refreshed else "pytest==7.0.0"
+    ]
+    # The faked git ls-files reports no files, so refreshed sections are empty
+    assert (data["project_structure"] == {}) is structure_refreshed
+    assert (data["source_code"]["files"] == []) is sources_refreshed
+
+
+def _git(repo, *args):
+    """Run a git command in repo with a fixed committer identity."""
+    subprocess.run(
+        ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+        cwd=repo,
+        capture_output=True,
+        check=True,
+    )
+
+
+def test_changed_files_of_merge_commit(tmp_path):
+    """Test that root and merge commits report the files they changed."""
+    _git(tmp_path, "init", "-q", "-b", "main")
+    _touch_many([tmp_path / "README.md"])
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "commit", "-q", "-m", "root")
+    assert get_changed_files(cwd=str(tmp_path)) == {"README.md"}
+    _git(tmp_path, "checkout", "-q", "-b", "feature")
+    _touch_many([tmp_path / "pyproject.toml"])
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "commit", "-q", "-m", "feature")
+    _git(tmp_path, "checkout", "-q", "main")
+    _touch_many([tmp_path / "main.py"])
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "commit", "-q", "-m", "main")
+    _git(tmp_path, "merge", "-q", "--no-ff", "--no-edit", "feature")
+
+    assert get_changed_files(cwd=str(tmp_path)) == {"pyproject.toml"}
+
+
+@pytest.mark.parametrize("mtime", [1711497600.0, 1711540799.5, 1711583999.9])
+def test_format_mtime_matches_local_date(mtime):
+    """Test that mtime formatting matches the local calendar date."""
+    assert format_mtime(mtime) == datetime.fromtimestamp(mtime).strftime("%Y-%m-%d")
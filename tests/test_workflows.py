@@ -5,49 +5,58 @@ import os
 import pytest
 import yaml
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # pragma: no cover
+    from yaml import SafeLoader
 
-@pytest.mark.parametrize(
-    "workflow_file",
-    [
-        ".github/workflows/ci.yml",
-        ".github/workflows/cd.yml",
-    ],
-)
-def test_workflow_files_exist(workflow_file):
+
+def test_workflow_files_exist():
     """Test that required workflow files exist."""
-    assert os.path.exists(workflow_file), f"{workflow_file} does not exist"
+    # One directory listing answers both checks
+    with os.scandir(".github/workflows") as entries:
+        names = {entry.name for entry in entries}
+    assert "ci.yml" in names, "ci.yml does not exist"
+    assert "cd.yml" in names, "cd.yml does not exist"
 
 
-def test_ci_workflow_structure():
-    """Test CI workflow structure and required fields."""
+@pytest.fixture(scope="session")
+def ci_workflow():
+    """Fixture providing the CI workflow, parsed once per session."""
     with open(".github/workflows/ci.yml") as f:
-        workflow = yaml.safe_load(f)
-
-    assert "name" in workflow
-    assert workflow["name"] == "CI"
-    assert True in workflow  # YAML parses 'on' as True
-    assert "jobs" in workflow
-    assert "test" in workflow["jobs"]
+        return yaml.load(f, Loader=SafeLoader)
 
 
-def test_cd_workflow_structure():
-    """Test CD workflow structure and required fields."""
+@pytest.fixture(scope="session")
+def cd_workflow():
+    """Fixture providing the CD workflow, parsed once per session."""
     with open(".github/workflows/cd.yml") as f:
-        workflow = yaml.safe_load(f)
+        return yaml.load(f, Loader=SafeLoader)
 
-    assert "name" in workflow
-    assert workflow["name"] == "CD"
-    assert True in workflow  # YAML parses 'on' as True
-    assert "jobs" in workflow
-    assert "deploy" in workflow["jobs"]
 
+def test_ci_workflow_structure(ci_workflow):
+    """Test CI workflow structure and required fields."""
+    assert "name" in ci_workflow
+    assert ci_workflow["name"] == "CI"
+    assert True in ci_workflow  # YAML parses 'on' as True
+    assert "jobs" in ci_workflow
+    assert "test" in ci_workflow["jobs"]
 
-def test_ci_workflow_steps():
-    """Test CI workflow contains required steps."""
-    with open(".github/workflows/ci.yml") as f:
-        workflow = yaml.safe_load(f)
 
-    steps = workflow["jobs"]["test"]["steps"]
-    assert any(step.get("uses", "").startswith("actions/checkout") for step in steps)
-    assert any("setup-python" in step.get("uses", "") for step in steps)
-    assert any("Run tests" in step.get("name", "") for step in steps)
+def test_cd_workflow_structure(cd_workflow):
+    """Test CD workflow structure and required fields."""
+    assert "name" in cd_workflow
+    assert cd_workflow["name"] == "CD"
+    assert True in cd_workflow  # YAML parses 'on' as True
+    assert "jobs" in cd_workflow
+    assert "deploy" in cd_workflow["jobs"]
+
+
+def test_ci_workflow_steps(ci_workflow):
+    """Test CI workflow contains required steps."""
+    steps = ci_workflow["jobs"]["test"]["steps"]
+    uses = [step.get("uses", "") for step in steps]
+    names = [step.get("name", "") for step in steps]
+    assert any(action.startswith("actions/checkout") for action in uses)
+    assert any("setup-python" in action for action in uses)
+    assert any("Run tests" in name for name in names)